@@ -1,15 +1,46 @@
 import requests
+from requests.adapters import HTTPAdapter
 import yaml
 import signal
 import sys
 import json
 import logging
-import time,os,sys
-# Make sure app path is in sys.path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import time,os
+import glob
 from util.logger import setup_logger
 import threading
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from bisect import bisect_left
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Prefer the libyaml-backed loader; fall back to the pure-Python one
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+# orjson decodes response bytes directly; fall back to the stdlib decoder
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+def _probe_response(status: str, body: bytes) -> bytes:
+    """
+    Builds a complete HTTP response (status line, headers and body) for a probe.
+    """
+    return (f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: text/plain\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: close\r\n\r\n").encode("ascii") + body
+
+# Probe responses never change, so they are built once and sent with a single write
+_PROBE_RESPONSES = {
+    "/healthz": (200, _probe_response("200 OK", b"OK")),
+    "/readyz": (200, _probe_response("200 OK", b"Ready")),
+}
+_PROBE_NOT_FOUND = (404, _probe_response("404 Not Found", b""))
 
 class HealthHandler(BaseHTTPRequestHandler):
     """
@@ -20,32 +51,55 @@ class HealthHandler(BaseHTTPRequestHandler):
     - "/readyz": Returns a 200 OK response with the body "Ready", indicating the service is ready.
     - Any other path: Returns a 404 Not Found response.
 
+    Responses are prebuilt and written with one `wfile.write` call, and Nagle's
+    algorithm is disabled on each connection so the tiny responses go out
+    immediately instead of waiting on delayed ACKs.
+
     Methods:
         do_GET():
             Handles HTTP GET requests and provides appropriate responses based on the request path.
+        log_request():
+            Routes per-request access logs to the debug logger instead of stderr.
+        log_error():
+            Routes malformed-request and protocol errors to the warning logger.
     """
+    # Makes StreamRequestHandler.setup() set TCP_NODELAY on the accepted socket
+    disable_nagle_algorithm = True
+
     def do_GET(self):
-        if self.path == "/healthz":
-            self.send_response(200)
-            self.end_headers()
-            self.wfile.write(b"OK")
-        elif self.path == "/readyz":
-            self.send_response(200)
-            self.end_headers()
-            self.wfile.write(b"Ready")
-        else:
-            self.send_response(404)
-            self.end_headers()
+        code, response = _PROBE_RESPONSES.get(self.path, _PROBE_NOT_FOUND)
+        self.wfile.write(response)
+        self.close_connection = True
+        self.log_request(code, len(response))
+
+    def log_request(self, code="-", size="-"):
+        # Probes hit these endpoints every few seconds; keep them out of stderr
+        if isinstance(code, HTTPStatus):
+            code = code.value
+        logging.debug('health probe: "%s" %s %s', self.requestline, code, size)
 
-# Setup default logging early so startup errors are visible
-setup_logger(log_level=logging.INFO)
+    def log_error(self, format, *args):
+        logging.warning("health probe error from %s: " + format, self.address_string(), *args)
 
-def run(server_class=HTTPServer, handler_class=HealthHandler, port=8080):
+class HealthHTTPServer(ThreadingHTTPServer):
+    """
+    A threading HTTP server tuned for Kubernetes probe traffic.
+
+    Allows quick restarts on the same port and keeps a deeper accept backlog
+    than the `socketserver` default of 5, so bursts of probes are not refused.
+    """
+    allow_reuse_address = True
+    request_queue_size = 128
+
+def run(server_class=HealthHTTPServer, handler_class=HealthHandler, port=8080):
     """
     Starts an HTTP server for health probes.
 
+    Each connection is served on its own daemon thread, so a slow or stalled
+    probe client cannot block the liveness and readiness checks behind it.
+
     Args:
-        server_class (type): The class to use for the HTTP server. Defaults to `HTTPServer`.
+        server_class (type): The class to use for the HTTP server. Defaults to `HealthHTTPServer`.
         handler_class (type): The request handler class to use. Defaults to `HealthHandler`.
         port (int): The port number on which the server will listen. Defaults to 8080.
 
@@ -70,6 +124,120 @@ def run(server_class=HTTPServer, handler_class=HealthHandler, port=8080):
     httpd.serve_forever()
 
 
+# Parsed configs keyed on (path, mtime_ns, size), most recently used last
+_CONFIG_CACHE = OrderedDict()
+_CONFIG_CACHE_MAX = 100
+
+def load_config(config_path: str) -> dict:
+    """
+    Loads a YAML configuration file, reusing a previously parsed copy when possible.
+
+    Parsed configs are cached in memory and in a JSON file next to the config,
+    both keyed on the file's path, modification time and size, so an edited
+    file is always re-parsed. Failing to write the JSON cache (e.g. on a
+    read-only mount) is not an error.
+
+    Args:
+        config_path (str): Path to the YAML configuration file.
+
+    Returns:
+        dict: The parsed configuration.
+    """
+    st = os.stat(config_path)
+    key = (os.path.abspath(config_path), st.st_mtime_ns, st.st_size)
+    if key in _CONFIG_CACHE:
+        _CONFIG_CACHE.move_to_end(key)
+        return _CONFIG_CACHE[key]
+
+    cache_path = f"{config_path}.{st.st_mtime_ns}.{st.st_size}.json"
+    try:
+        with open(cache_path, "rb") as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        with open(config_path, "rb") as f:
+            config = yaml.load(f, Loader=_Loader)
+        _write_config_cache(config_path, cache_path, config)
+
+    _CONFIG_CACHE[key] = config
+    if len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+        _CONFIG_CACHE.popitem(last=False)
+    return config
+
+def _write_config_cache(config_path: str, cache_path: str, config):
+    """
+    Atomically writes the JSON cache for a parsed config.
+
+    The cache is skipped when the config does not survive a JSON round trip
+    unchanged (e.g. YAML dates or non-string keys). Once the new cache is in
+    place, caches this function wrote for earlier versions of the config are
+    removed; other `{config_path}.*.json` files are left alone.
+    """
+    try:
+        data = json.dumps(config)
+        if json.loads(data) != config:
+            return
+    except (TypeError, ValueError):
+        return
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logging.debug("Could not write config cache %s: %s", cache_path, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+
+    # Only remove files in the {config_path}.<mtime_ns>.<size>.json shape written above
+    for stale_path in glob.glob(f"{glob.escape(config_path)}.[0-9]*.[0-9]*.json"):
+        parts = stale_path[len(config_path) + 1:-len(".json")].split(".")
+        if stale_path == cache_path or len(parts) != 2 or not all(p.isdigit() for p in parts):
+            continue
+        try:
+            os.remove(stale_path)
+        except OSError:
+            pass
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+# Required settings: (key, check, description of a valid value)
+_CONFIG_SCHEMA = (
+    ("base_url", lambda v: isinstance(v, str) and v != "", "a non-empty URL"),
+    ("cpu_threshold", lambda v: _is_number(v) and 0 < v <= 1, "a number > 0 and <= 1"),
+    ("scale_up_step", lambda v: _is_int(v) and v >= 1, "an integer >= 1"),
+    ("scale_down_step", lambda v: _is_int(v) and v >= 1, "an integer >= 1"),
+    ("poll_interval", lambda v: _is_number(v) and v > 0, "a number > 0"),
+    ("tasks", lambda v: isinstance(v, list) and all(isinstance(t, dict) for t in v), "a list of tasks"),
+)
+
+def validate_config(config) -> list:
+    """
+    Checks a parsed configuration against `_CONFIG_SCHEMA` in a single pass.
+
+    Every setting is checked, so all problems are reported at once rather
+    than one per restart.
+
+    Args:
+        config: The parsed configuration.
+
+    Returns:
+        list: A message for each invalid or missing setting; empty if the
+        configuration is valid.
+    """
+    if not isinstance(config, dict):
+        return ["config must be a mapping of settings"]
+    return [
+        f"{key} must be {description}, got {config.get(key)!r}"
+        for key, check, description in _CONFIG_SCHEMA
+        if not check(config.get(key))
+    ]
 
 def startup():
     """
@@ -79,19 +247,16 @@ def startup():
     configuration values from a YAML file specified as a command-line argument.
     """
     if len(sys.argv) < 3 or sys.argv[1] != "--config":
-        logging.error("Usage: python3 auto_scaler.py --config config.yaml")
+        logging.error("Usage: python3 -m app.auto_scaler --config config.yaml")
         sys.exit(1)
 
     config_path = sys.argv[2]
-    with open(config_path, "r") as f:
-        config = yaml.safe_load(f)
+    config = load_config(config_path)
 
-    # Validate config values
-    if not (0 < config.get("cpu_threshold", 0) <= 1):
-        logging.error("Invalid cpu_threshold in config: %s", config.get("cpu_threshold"))
-        sys.exit(1)
-    if config.get("scale_up_step", 0) < 1 or config.get("scale_down_step", 0) < 1:
-        logging.error("Scale steps must be >= 1")
+    errors = validate_config(config)
+    if errors:
+        for error in errors:
+            logging.error("Invalid config: %s", error)
         sys.exit(1)
 
     return config
@@ -101,9 +266,10 @@ def signal_handler(sig, frame):
     """
     Handles termination signals to gracefully stop the autoscaler.
 
-    This function is triggered when a termination signal (e.g., SIGINT or SIGTERM) 
-    is received. It logs a message indicating that the autoscaler was stopped by 
-    user input and then exits the program.
+    This function is triggered when SIGINT (user input) or SIGTERM (e.g. a Kubernetes
+    pod shutdown) is received. It logs which signal stopped the autoscaler and then
+    exits the program through `sys.exit`, so atexit hooks run and queued log
+    records are flushed.
 
     Args:
         sig (int): The signal number received.
@@ -112,33 +278,50 @@ def signal_handler(sig, frame):
     Returns:
         None
     """
-    logging.info("Autoscaler stopped by user input.")
+    if sig == signal.SIGINT:
+        logging.info("Autoscaler stopped by user input.")
+    else:
+        logging.info("Autoscaler stopped by %s.", signal.Signals(sig).name)
+    _SESSION.close()
     sys.exit(0)
 
-signal.signal(signal.SIGINT, signal_handler)
+# Populated from the loaded config by configure()
+config = {}
+BASE_URL = None
+CPU_THRESHOLD = None
+SCALE_UP_STEP = None
+SCALE_DOWN_STEP = None
+POLL_INTERVAL = None
+PROBE_PORT = 8080
 
-config = startup()
+# Task lookup tables built from config["tasks"] by configure()
+TASKS_BY_NAME = {}
+TASK_NAMES = []
 
-# Override logger settings based on config
-log_level_name = config.get("logging", {}).get("level", "INFO")
-log_format = config.get("logging", {}).get("format", "%(asctime)s - %(levelname)s - %(message)s")
-setup_logger(log_level=getattr(logging, log_level_name, logging.INFO), log_format=log_format)
+def index_tasks(tasks: list) -> tuple:
+    """
+    Builds the lookup tables used by `find_task`.
 
-BASE_URL = config["base_url"]
-CPU_THRESHOLD = config["cpu_threshold"]
-SCALE_UP_STEP = config["scale_up_step"]
-SCALE_DOWN_STEP = config["scale_down_step"]
-POLL_INTERVAL = config["poll_interval"]
+    Args:
+        tasks (list): The task dictionaries from the configuration.
 
-PROBE_PORT = config.get("probe_port", 8080)
+    Returns:
+        tuple: `(tasks_by_name, sorted_names)`. When several tasks share a name,
+        the first one in the configuration wins.
+    """
+    tasks_by_name = {}
+    for t in tasks:
+        tasks_by_name.setdefault(t.get("name", ""), t)
+    return tasks_by_name, sorted(tasks_by_name)
 
 def find_task(prefix: str) -> dict:
     """
     Searches for a task in the configuration that matches the given prefix.
 
-    This function iterates through the list of tasks in the configuration
-    and returns the first task whose "name" matches the given prefix exactly
-    or starts with the prefix.
+    A task whose "name" matches the prefix exactly is preferred; otherwise the
+    task with the alphabetically first name starting with the prefix is
+    returned. Both lookups use the tables built by `index_tasks`, so no scan of
+    the task list is needed.
 
     Args:
         prefix (str): The prefix to search for in the task names.
@@ -149,15 +332,101 @@ def find_task(prefix: str) -> dict:
     Raises:
         KeyError: If no task with the given prefix is found in the configuration.
     """
-    for t in config.get("tasks", []):
-        if t.get("name") == prefix or t.get("name", "").startswith(prefix):
-            return t
+    task = TASKS_BY_NAME.get(prefix)
+    if task is not None:
+        return task
+    i = bisect_left(TASK_NAMES, prefix)
+    if i < len(TASK_NAMES) and TASK_NAMES[i].startswith(prefix):
+        return TASKS_BY_NAME[TASK_NAMES[i]]
     raise KeyError(f"Task with prefix {prefix} not found in config")
 
-get_task = find_task("auto_scaler_get_status")
-put_task = find_task("auto_scaler_update_replicas")
+def resolve_request(task: dict) -> tuple:
+    """
+    Resolves a task's request configuration into the arguments for `make_request`.
+
+    Args:
+        task (dict): A task dictionary whose "request" entry holds "method",
+            "endpoint" and optionally "headers".
+
+    Returns:
+        tuple: `(method, url, headers)`, where `url` is `BASE_URL` joined with the
+        endpoint and `headers` is None when the task sets none.
+    """
+    request = task["request"]
+    return request["method"], BASE_URL + request["endpoint"], request.get("headers") or None
+
+# The polling loop only ever sends these two requests; configure() resolves them once
+GET_METHOD, GET_URL, GET_HEADERS = None, None, None
+PUT_METHOD, PUT_URL, PUT_HEADERS = None, None, None
 
-def parse_response(resp: requests.Response):
+def configure(cfg: dict):
+    """
+    Applies a validated configuration to the module-level settings.
+
+    Sets the scaling constants, the probe port, the task index and the resolved
+    status and update requests used by `run_autoscaler`.
+
+    Args:
+        cfg (dict): The configuration returned by `startup()`.
+
+    Raises:
+        KeyError: If a required setting or task is missing from the configuration.
+    """
+    global config, BASE_URL, CPU_THRESHOLD, SCALE_UP_STEP, SCALE_DOWN_STEP, POLL_INTERVAL, PROBE_PORT
+    global TASKS_BY_NAME, TASK_NAMES, GET_METHOD, GET_URL, GET_HEADERS, PUT_METHOD, PUT_URL, PUT_HEADERS
+
+    config = cfg
+    BASE_URL = config["base_url"]
+    CPU_THRESHOLD = config["cpu_threshold"]
+    SCALE_UP_STEP = config["scale_up_step"]
+    SCALE_DOWN_STEP = config["scale_down_step"]
+    POLL_INTERVAL = config["poll_interval"]
+    PROBE_PORT = config.get("probe_port", 8080)
+
+    TASKS_BY_NAME, TASK_NAMES = index_tasks(config.get("tasks", []))
+    get_task = find_task("auto_scaler_get_status")
+    put_task = find_task("auto_scaler_update_replicas")
+    GET_METHOD, GET_URL, GET_HEADERS = resolve_request(get_task)
+    PUT_METHOD, PUT_URL, PUT_HEADERS = resolve_request(put_task)
+
+class ParsedResponse:
+    """
+    The components of an HTTP response needed by the autoscaler.
+
+    Only the status code and JSON body are extracted up front. The headers are
+    copied from the underlying response on first access and cached, and the raw
+    body is kept as bytes, so the polling loop never decodes or copies them
+    unless they are actually logged.
+
+    Attributes:
+        status_code (int): The HTTP status code of the response.
+        json_body (dict or None): The JSON-decoded body of the response, or None
+            if the response is not declared as JSON or its body is not valid JSON.
+        headers (dict): A dictionary of the response headers (computed lazily, once).
+        raw (bytes): The undecoded body of the response (read lazily, once).
+    """
+    __slots__ = ("_resp", "_headers", "_raw", "status_code", "json_body")
+
+    def __init__(self, resp: requests.Response, json_body):
+        self._resp = resp
+        self._headers = None
+        self._raw = None
+        self.status_code = resp.status_code
+        self.json_body = json_body
+
+    @property
+    def headers(self) -> dict:
+        if self._headers is None:
+            self._headers = dict(self._resp.headers)
+        return self._headers
+
+    @property
+    def raw(self) -> bytes:
+        if self._raw is None:
+            self._raw = self._resp.content or b""
+        return self._raw
+
+def parse_response(resp: requests.Response) -> ParsedResponse:
     """
     Parses an HTTP response object and extracts key components.
 
@@ -165,21 +434,17 @@ def parse_response(resp: requests.Response):
         resp (requests.Response): The HTTP response object to parse.
 
     Returns:
-        tuple: A tuple containing the following elements:
-            - status_code (int): The HTTP status code of the response.
-            - headers (dict): A dictionary of the response headers.
-            - raw (str): The raw text content of the response.
-            - json_body (dict or None): The JSON-decoded body of the response, 
-              or None if the response body is not valid JSON.
-    """
-    status_code = resp.status_code
-    headers = dict(resp.headers)
-    raw = resp.text or ""
-    try:
-        json_body = resp.json()
-    except ValueError:
-        json_body = None
-    return status_code, headers, raw, json_body
+        ParsedResponse: The status code and JSON body of the response, with
+        the headers and raw body available on demand.
+    """
+    json_body = None
+    # MIME types are case-insensitive, e.g. "Application/JSON"
+    if "json" in resp.headers.get("content-type", "").lower():
+        try:
+            json_body = _json_loads(resp.content)
+        except ValueError:
+            pass
+    return ParsedResponse(resp, json_body)
 
 def pretty(obj):
     """
@@ -200,58 +465,129 @@ def pretty(obj):
     except Exception:
         return str(obj)
 
-def make_request(task: dict, payload: dict = None):
+class _Lazy:
+    """
+    Defers building a log argument until a handler actually formats the record.
+
+    `logging` only calls `str()` on its arguments when a record is emitted, so
+    wrapping an expensive formatter costs nothing for filtered records.
     """
-    Sends an HTTP request based on the provided task configuration and optional payload.
+    __slots__ = ("f",)
+
+    def __init__(self, f):
+        self.f = f
+
+    def __str__(self):
+        return self.f()
+
+# Shared session so every poll reuses the same pooled keep-alive connection
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+def make_request(method: str, url: str, headers: dict = None, payload: dict = None):
+    """
+    Sends an HTTP request with an optional JSON payload.
     Args:
-        task (dict): A dictionary containing the request configuration. It must include:
-            - "request" (dict): A dictionary with the following keys:
-                - "method" (str): The HTTP method (e.g., "GET", "POST").
-                - "endpoint" (str): The API endpoint to send the request to.
-                - "headers" (dict, optional): Additional headers to include in the request.
+        method (str): The HTTP method (e.g., "GET", "POST").
+        url (str): The full URL to send the request to (see `resolve_request`).
+        headers (dict, optional): Additional headers to include in the request. Defaults to None.
         payload (dict, optional): A dictionary representing the JSON payload to send with the request. Defaults to None.
     Returns:
         dict or None: The parsed JSON response body if the request is successful and contains a JSON response.
                       Returns an empty dictionary if the response body is empty.
                       Returns None if the request fails or an HTTP error occurs.
     Logs:
-        - Logs the request method, endpoint, payload (if provided), status code, and response body.
-        - Logs headers and raw response body at the debug level if the response body is not JSON.
+        - Logs the request method, URL, payload (if provided), status code, and response body.
+        - Logs headers, and the first 512 bytes of the raw body if it is not JSON, at the debug level.
         - Logs errors if the request fails or returns a non-2xx HTTP status code.
     """
     try:
-        resp = requests.request(
-            method=task["request"]["method"],
-            url=BASE_URL + task["request"]["endpoint"],
-            headers=task["request"].get("headers", {}),
+        resp = _SESSION.request(
+            method=method,
+            url=url,
+            headers=headers,
             json=payload,
             timeout=5,
         )
     except requests.RequestException as e:
-        logging.error("%s request failed: %s", task["request"]["method"], e)
+        logging.error("%s request failed: %s", method, e)
         return None
 
-    status_code, headers, raw, json_body = parse_response(resp)
-    body_repr = pretty(json_body) if json_body is not None else "{}"
+    parsed = parse_response(resp)
+    status_code, json_body = parsed.status_code, parsed.json_body
+    body_repr = _Lazy(lambda: pretty(json_body)) if json_body is not None else "{}"
     logging.info("%s %s%s%s %s %s",
-                 task["request"]["method"],
-                 task["request"]["endpoint"],
-                 " payload=" if payload else "", pretty(payload) if payload else "",
+                 method,
+                 url,
+                 " payload=" if payload else "", _Lazy(lambda: pretty(payload)) if payload else "",
                  status_code, body_repr)
-    
-    logging.debug("%s headers=%s", task["request"]["method"], headers)
-    if json_body is None:
-        logging.debug("%s raw body: %s", task["request"]["method"], raw)
+
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("%s headers=%s", method, parsed.headers)
+        if json_body is None:
+            logging.debug("%s raw body: %s", method, parsed.raw[:512])
 
     try:
         resp.raise_for_status()
     except requests.RequestException:
-        logging.error("%s returned HTTP %s", task["request"]["method"], status_code)
+        logging.error("%s returned HTTP %s", method, status_code)
         return None
 
     return json_body if json_body is not None else {}
 
 
+def parse_status(status: dict):
+    """
+    Validates a status response and extracts the values the autoscaler acts on.
+
+    Args:
+        status (dict): The JSON body returned by the status endpoint.
+
+    Returns:
+        tuple or None: `(cpu_util, replicas)` if the status is valid, where
+        `cpu_util` is a number between 0 and 1 and `replicas` is an int >= 1.
+        Returns None, after logging a warning, if either value is missing or invalid.
+    """
+    try:
+        cpu_util = status["cpu"]["highPriority"]
+        replicas = status["replicas"]
+    except (KeyError, TypeError):
+        logging.warning("Incomplete status from API: %s", _Lazy(lambda: pretty(status)))
+        return None
+    if not isinstance(cpu_util, (float, int)) or not (0 <= cpu_util <= 1):
+        logging.warning("Invalid CPU util from API: %s", cpu_util)
+        return None
+    if not isinstance(replicas, int) or replicas < 1:
+        logging.warning("Invalid replicas from API: %s", replicas)
+        return None
+    return cpu_util, replicas
+
+def make_decider(threshold: float, up_step: int, down_step: int):
+    """
+    Builds the scaling decision function for a fixed threshold and step sizes.
+
+    The settings never change after startup, so they are bound into a closure
+    once instead of being looked up on every poll.
+
+    Args:
+        threshold (float): Target CPU utilization threshold.
+        up_step (int): Number of replicas to add when scaling up.
+        down_step (int): Number of replicas to remove when scaling down.
+
+    Returns:
+        callable: `decide(cpu_util, replicas) -> int` returning the desired number
+        of replicas, which is never below 1 and equals `replicas` when no
+        scaling is needed.
+    """
+    def decide(cpu_util, replicas):
+        if cpu_util == threshold:
+            return replicas
+        if cpu_util > threshold:
+            return replicas + up_step
+        # Making sure that it should not go below 1 replica
+        return max(1, replicas - down_step)
+    return decide
 
 def run_autoscaler():
     """
@@ -270,8 +606,11 @@ def run_autoscaler():
     and scaling actions taken.
 
     Note:
-    - The function runs indefinitely in a loop with a sleep interval between iterations.
-    - It relies on external functions `make_request`, `get_task`, and `put_task` for API interactions.
+    - An update request is only sent when the desired number of replicas differs from the current one.
+    - The function runs indefinitely, polling on a fixed `POLL_INTERVAL` schedule measured with
+      `time.monotonic()`. Time spent in API calls is subtracted from the sleep, and ticks
+      missed because of a slow API are skipped rather than run back to back.
+    - It relies on `make_request` and the resolved `GET_*` / `PUT_*` request constants for API interactions.
     - The following constants must be defined in the module:
         - `CPU_THRESHOLD`: Target CPU utilization threshold (float between 0 and 1).
         - `SCALE_UP_STEP`: Number of replicas to add when scaling up.
@@ -282,42 +621,50 @@ def run_autoscaler():
             ValueError: If the API returns invalid data for CPU utilization or replicas.
     """
 
-    logging.info("Starting autoscaler loop (target CPU=%s)", CPU_THRESHOLD)
+    # Bind everything the loop touches to locals once, instead of looking up
+    # module globals on every iteration
+    request, parse = make_request, parse_status
+    sleep, monotonic = time.sleep, time.monotonic
+    info = logging.info
+    get_method, get_url, get_headers = GET_METHOD, GET_URL, GET_HEADERS
+    put_method, put_url, put_headers = PUT_METHOD, PUT_URL, PUT_HEADERS
+    threshold, poll_interval = CPU_THRESHOLD, POLL_INTERVAL
+    decide = make_decider(CPU_THRESHOLD, SCALE_UP_STEP, SCALE_DOWN_STEP)
+
+    info("Starting autoscaler loop (target CPU=%s)", threshold)
+    next_tick = monotonic()
     while True:
-        status = make_request(get_task)
-        if status is None:
-            time.sleep(POLL_INTERVAL)
-            continue
-
-        cpu_util = status.get("cpu", {}).get("highPriority")
-        replicas = status.get("replicas")
-
-        if not isinstance(cpu_util, (float, int)) or not (0 <= cpu_util <= 1):
-            logging.warning("Invalid CPU util from API: %s", cpu_util)
-            time.sleep(POLL_INTERVAL)
-            continue
-        if not isinstance(replicas, int) or replicas < 1:
-            logging.warning("Invalid replicas from API: %s", replicas)
-            time.sleep(POLL_INTERVAL)
-            continue
-
-        #logging.info("CPU: %.2f, Replicas: %d", cpu_util, replicas)
-
-        if cpu_util == CPU_THRESHOLD:
-            logging.info("CPU is at target threshold, no scaling action taken.")
-        elif cpu_util > CPU_THRESHOLD:
-            new_replicas = replicas + SCALE_UP_STEP
-            logging.info("Scaling UP: CPU %.2f > %.2f, increasing replicas from %d to %d",
-                         cpu_util, CPU_THRESHOLD, replicas, new_replicas)
-            make_request(put_task, {"replicas": new_replicas})
-        elif cpu_util < CPU_THRESHOLD:
-            # Making sure that it should not go below 1 replica
-            new_replicas = max(1, replicas - SCALE_DOWN_STEP)
-            logging.info("Scaling Down: CPU %.2f < %.2f, decreasing replicas from %d to %d",
-                         cpu_util, CPU_THRESHOLD, replicas, new_replicas)
-            make_request(put_task, {"replicas": new_replicas})
-
-        time.sleep(POLL_INTERVAL)
+        status = request(get_method, get_url, get_headers)
+        parsed = parse(status) if status is not None else None
+
+        if parsed is not None:
+            cpu_util, replicas = parsed
+
+            new_replicas = decide(cpu_util, replicas)
+
+            if new_replicas > replicas:
+                info("Scaling UP: CPU %.2f > %.2f, increasing replicas from %d to %d",
+                     cpu_util, threshold, replicas, new_replicas,
+                     extra={"event": "scale_up", "cpu": cpu_util, "old": replicas, "new": new_replicas})
+                request(put_method, put_url, put_headers, {"replicas": new_replicas})
+            elif new_replicas < replicas:
+                info("Scaling Down: CPU %.2f < %.2f, decreasing replicas from %d to %d",
+                     cpu_util, threshold, replicas, new_replicas,
+                     extra={"event": "scale_down", "cpu": cpu_util, "old": replicas, "new": new_replicas})
+                request(put_method, put_url, put_headers, {"replicas": new_replicas})
+            elif cpu_util == threshold:
+                info("CPU is at target threshold, no scaling action taken.")
+            else:
+                info("CPU %.2f < %.2f but already at the minimum of 1 replica, no scaling action taken.",
+                     cpu_util, threshold)
+
+        # Sleep until the next tick of a fixed schedule so API latency does not
+        # stretch the interval; if we fell behind, skip the missed ticks
+        next_tick += poll_interval
+        now = monotonic()
+        if next_tick <= now:
+            next_tick += ((now - next_tick) // poll_interval + 1) * poll_interval
+        sleep(next_tick - now)
 
 def start_health_server():
     """
@@ -329,9 +676,23 @@ def start_health_server():
     Returns:
         None
     """
-    run(port=config.get("probe_port", 8080))
+    run(port=PROBE_PORT)
 
 if __name__ == "__main__":
+    # Setup default logging early so startup errors are visible
+    setup_logger(log_level=logging.INFO)
+    signal.signal(signal.SIGINT, signal_handler)
+    signal.signal(signal.SIGTERM, signal_handler)
+
+    cfg = startup()
+
+    # Override logger settings based on config
+    log_level_name = cfg.get("logging", {}).get("level", "INFO")
+    log_format = cfg.get("logging", {}).get("format", "%(asctime)s - %(levelname)s - %(message)s")
+    setup_logger(log_level=getattr(logging, log_level_name, logging.INFO), log_format=log_format)
+
+    configure(cfg)
+
     health_thread = threading.Thread(target=start_health_server, daemon=True)
     health_thread.start()
     run_autoscaler()
\ No newline at end of file
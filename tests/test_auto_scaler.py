@@ -1,67 +1,119 @@
 import pytest
 import requests
+from requests.structures import CaseInsensitiveDict
 from unittest.mock import patch, MagicMock
 import sys, os
+import logging
+import signal
 
 
-# Patch sys.argv BEFORE importing auto_scaler so startup() won't sys.exit
-def _prepare_config_file():
-    import tempfile
-    import textwrap
-    tmpdir = tempfile.mkdtemp()
-    config_path = os.path.join(tmpdir, "config.yaml")
-    with open(config_path, "w") as f:
-        f.write(textwrap.dedent("""\
-            base_url: http://localhost
-            cpu_threshold: 0.5
-            scale_up_step: 1
-            scale_down_step: 1
-            poll_interval: 1
-            tasks:
-              - name: auto_scaler_get_status
-                request:
-                  method: GET
-                  endpoint: /status
-              - name: auto_scaler_update_replicas
-                request:
-                  method: POST
-                  endpoint: /update
-        """))
-    return config_path
-
-sys.argv = ["auto_scaler.py", "--config", _prepare_config_file()]
-
-from app import auto_scaler  # Now safe to import
+from app import auto_scaler
+
+CONFIG_YAML = """\
+base_url: http://localhost
+cpu_threshold: 0.5
+scale_up_step: 1
+scale_down_step: 1
+poll_interval: 1
+tasks:
+  - name: auto_scaler_get_status
+    request:
+      method: GET
+      endpoint: /status
+  - name: auto_scaler_update_replicas
+    request:
+      method: POST
+      endpoint: /update
+"""
+
+
+@pytest.fixture(autouse=True)
+def configured(tmp_path, monkeypatch):
+    """Loads CONFIG_YAML through startup() the way the __main__ block does."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(CONFIG_YAML)
+    monkeypatch.setattr(sys, "argv", ["auto_scaler.py", "--config", str(config_path)])
+    auto_scaler.configure(auto_scaler.startup())
+
+
+def test_configure_resolves_requests():
+    assert auto_scaler.CPU_THRESHOLD == 0.5
+    assert (auto_scaler.GET_METHOD, auto_scaler.GET_URL) == ("GET", "http://localhost/status")
+    assert (auto_scaler.PUT_METHOD, auto_scaler.PUT_URL) == ("POST", "http://localhost/update")
+
+
+def test_startup_requires_config_argument(monkeypatch):
+    monkeypatch.setattr(sys, "argv", ["auto_scaler.py"])
+    with pytest.raises(SystemExit):
+        auto_scaler.startup()
 
 
 def test_parse_response_with_json():
     mock_resp = MagicMock(spec=requests.Response)
     mock_resp.status_code = 200
-    mock_resp.headers = {"Content-Type": "application/json"}
-    mock_resp.text = '{"key": "value"}'
-    mock_resp.json.return_value = {"key": "value"}
+    mock_resp.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+    mock_resp.content = b'{"key": "value"}'
 
-    status_code, headers, raw, json_body = auto_scaler.parse_response(mock_resp)
+    parsed = auto_scaler.parse_response(mock_resp)
 
-    assert status_code == 200
-    assert headers["Content-Type"] == "application/json"
-    assert raw == '{"key": "value"}'
-    assert json_body == {"key": "value"}
+    assert parsed.status_code == 200
+    assert parsed.headers["Content-Type"] == "application/json"
+    assert parsed.raw == b'{"key": "value"}'
+    assert parsed.json_body == {"key": "value"}
 
 
 def test_parse_response_with_invalid_json():
     mock_resp = MagicMock(spec=requests.Response)
     mock_resp.status_code = 200
-    mock_resp.headers = {}
-    mock_resp.text = "not-json"
-    mock_resp.json.side_effect = ValueError("Invalid JSON")
+    mock_resp.headers = CaseInsensitiveDict({"Content-Type": "application/json; charset=utf-8"})
+    mock_resp.content = b"not-json"
+
+    parsed = auto_scaler.parse_response(mock_resp)
+
+    assert parsed.status_code == 200
+    assert parsed.headers == {"Content-Type": "application/json; charset=utf-8"}
+    assert parsed.raw == b"not-json"
+    assert parsed.json_body is None
+
+
+def test_parse_response_copies_headers_once():
+    mock_resp = MagicMock(spec=requests.Response)
+    mock_resp.status_code = 200
+    mock_resp.headers = CaseInsensitiveDict({"Content-Type": "text/plain"})
+    mock_resp.content = b"ok"
 
-    status_code, headers, raw, json_body = auto_scaler.parse_response(mock_resp)
+    parsed = auto_scaler.parse_response(mock_resp)
 
-    assert status_code == 200
-    assert headers == {}
-    assert raw == "not-json"
-    assert json_body is None
+    assert parsed.headers is parsed.headers
+    assert parsed.raw is parsed.raw
+
+
+def test_parse_response_skips_non_json_content_type():
+    mock_resp = MagicMock(spec=requests.Response)
+    mock_resp.status_code = 200
+    mock_resp.headers = CaseInsensitiveDict({"Content-Type": "text/plain"})
+    mock_resp.content = b'{"key": "value"}'
+
+    with patch.object(auto_scaler, "_json_loads") as mock_loads:
+        parsed = auto_scaler.parse_response(mock_resp)
+
+    assert parsed.json_body is None
+    mock_loads.assert_not_called()
+
+
+@pytest.mark.parametrize("content_type", [
+    "application/json",
+    "Application/JSON",
+    "APPLICATION/JSON; charset=UTF-8",
+    "application/problem+json",
+])
+def test_parse_response_json_content_types(content_type):
+    mock_resp = MagicMock(spec=requests.Response)
+    mock_resp.status_code = 200
+    mock_resp.headers = CaseInsensitiveDict({"Content-Type": content_type})
+    mock_resp.content = b'{"key": "value"}'
+
+    assert auto_scaler.parse_response(mock_resp).json_body == {"key": "value"}
 
 
 def test_make_request_success():
@@ -76,13 +128,12 @@ def test_make_request_success():
 
     mock_resp = MagicMock(spec=requests.Response)
     mock_resp.status_code = 200
-    mock_resp.json.return_value = {"ok": True}
-    mock_resp.text = '{"ok": true}'
-    mock_resp.headers = {"Content-Type": "application/json"}
+    mock_resp.content = b'{"ok": true}'
+    mock_resp.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
     mock_resp.raise_for_status.return_value = None
 
-    with patch("requests.request", return_value=mock_resp) as mock_request:
-        result = auto_scaler.make_request(task)
+    with patch.object(auto_scaler._SESSION, "request", return_value=mock_resp) as mock_request:
+        result = auto_scaler.make_request(*auto_scaler.resolve_request(task))
 
     mock_request.assert_called_once_with(
         method="GET",
@@ -106,13 +157,12 @@ def test_make_request_http_error():
 
     mock_resp = MagicMock(spec=requests.Response)
     mock_resp.status_code = 500
-    mock_resp.json.return_value = {"error": "server error"}
-    mock_resp.text = '{"error": "server error"}'
-    mock_resp.headers = {}
+    mock_resp.content = b'{"error": "server error"}'
+    mock_resp.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
     mock_resp.raise_for_status.side_effect = requests.RequestException("Server Error")
 
-    with patch("requests.request", return_value=mock_resp):
-        result = auto_scaler.make_request(task)
+    with patch.object(auto_scaler._SESSION, "request", return_value=mock_resp):
+        result = auto_scaler.make_request(*auto_scaler.resolve_request(task))
 
     assert result is None
 
@@ -126,24 +176,302 @@ def test_make_request_connection_error():
     }
     auto_scaler.BASE_URL = "http://localhost"
 
-    with patch("requests.request", side_effect=requests.RequestException("Network fail")):
-        result = auto_scaler.make_request(task)
+    with patch.object(auto_scaler._SESSION, "request", side_effect=requests.RequestException("Network fail")):
+        result = auto_scaler.make_request(*auto_scaler.resolve_request(task))
 
     assert result is None
 
 
+def test_resolve_request_without_headers():
+    auto_scaler.BASE_URL = "http://localhost"
+    task = {"request": {"method": "PUT", "endpoint": "/replicas", "headers": {}}}
+
+    assert auto_scaler.resolve_request(task) == ("PUT", "http://localhost/replicas", None)
+
+
 def test_find_task_found():
     tasks = [
         {"name": "abc"},
         {"name": "mytask123"},
     ]
-    config = {"tasks": tasks}
-    auto_scaler.config = config
+    auto_scaler.TASKS_BY_NAME, auto_scaler.TASK_NAMES = auto_scaler.index_tasks(tasks)
 
     assert auto_scaler.find_task("mytask") == {"name": "mytask123"}
 
 
+def test_find_task_prefers_exact_match():
+    tasks = [
+        {"name": "mytask123"},
+        {"name": "mytask"},
+        {"name": "mytask", "duplicate": True},
+    ]
+    auto_scaler.TASKS_BY_NAME, auto_scaler.TASK_NAMES = auto_scaler.index_tasks(tasks)
+
+    assert auto_scaler.find_task("mytask") == {"name": "mytask"}
+
+
 def test_find_task_not_found():
-    auto_scaler.config = {"tasks": [{"name": "a"}]}
+    auto_scaler.TASKS_BY_NAME, auto_scaler.TASK_NAMES = auto_scaler.index_tasks([{"name": "a"}, {"name": "z"}])
     with pytest.raises(KeyError):
         auto_scaler.find_task("nope")
+
+
+def test_load_config_writes_and_reuses_json_cache(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("cpu_threshold: 0.5\n")
+    st = os.stat(config_path)
+    cache_path = tmp_path / f"config.yaml.{st.st_mtime_ns}.{st.st_size}.json"
+
+    assert auto_scaler.load_config(str(config_path)) == {"cpu_threshold": 0.5}
+    assert cache_path.exists()
+
+    auto_scaler._CONFIG_CACHE.clear()
+    with patch("yaml.load") as mock_load:
+        assert auto_scaler.load_config(str(config_path)) == {"cpu_threshold": 0.5}
+    mock_load.assert_not_called()
+
+
+def test_load_config_reparses_modified_file(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("cpu_threshold: 0.5\n")
+    auto_scaler.load_config(str(config_path))
+
+    config_path.write_text("cpu_threshold: 0.75\n")
+    assert auto_scaler.load_config(str(config_path)) == {"cpu_threshold": 0.75}
+
+
+def test_load_config_keeps_one_cache_file_per_config(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    for value in ("0.5", "0.75", "0.125"):
+        config_path.write_text(f"cpu_threshold: {value}\n")
+        auto_scaler.load_config(str(config_path))
+
+    st = os.stat(config_path)
+    cache_files = sorted(p.name for p in tmp_path.glob("config.yaml.*.json"))
+    assert cache_files == [f"config.yaml.{st.st_mtime_ns}.{st.st_size}.json"]
+
+
+def test_load_config_keeps_unrelated_json_siblings(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("cpu_threshold: 0.5\n")
+    unrelated = ["config.yaml.prod.json", "config.yaml.backup.json", "config.yaml.1.2.3.json"]
+    for name in unrelated:
+        (tmp_path / name).write_text("{}")
+    (tmp_path / "config.yaml.1.2.json").write_text("{}")  # stale cache shape
+
+    auto_scaler.load_config(str(config_path))
+
+    for name in unrelated:
+        assert (tmp_path / name).exists()
+    assert not (tmp_path / "config.yaml.1.2.json").exists()
+
+
+@pytest.fixture
+def health_server():
+    import threading
+
+    server = auto_scaler.HealthHTTPServer(("127.0.0.1", 0), auto_scaler.HealthHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("path, status, body", [
+    ("/healthz", 200, "OK"),
+    ("/readyz", 200, "Ready"),
+    ("/missing", 404, ""),
+])
+def test_health_handler(health_server, path, status, body):
+    resp = requests.get(health_server + path, timeout=5)
+
+    assert resp.status_code == status
+    assert resp.text == body
+    assert resp.headers["Content-Length"] == str(len(body))
+
+
+def test_health_server_settings():
+    assert auto_scaler.HealthHTTPServer.request_queue_size == 128
+    assert auto_scaler.HealthHTTPServer.allow_reuse_address
+    assert auto_scaler.HealthHTTPServer.daemon_threads
+
+
+def test_health_handler_disables_nagle():
+    import socket
+    import threading
+
+    nodelay = []
+
+    class RecordingHandler(auto_scaler.HealthHandler):
+        def do_GET(self):
+            nodelay.append(self.request.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+            super().do_GET()
+
+    server = auto_scaler.HealthHTTPServer(("127.0.0.1", 0), RecordingHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True)
+    thread.start()
+    try:
+        requests.get(f"http://127.0.0.1:{server.server_address[1]}/healthz", timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert nodelay and nodelay[0] != 0
+
+
+def test_health_handler_logs_bad_requests_as_warnings(health_server, caplog):
+    import socket
+    from urllib.parse import urlsplit
+
+    url = urlsplit(health_server)
+    with caplog.at_level(logging.DEBUG):
+        with socket.create_connection((url.hostname, url.port), timeout=5) as sock:
+            sock.sendall(b"NOT-HTTP\r\n\r\n")
+            sock.recv(1024)
+
+    warnings = [r for r in caplog.records if r.levelno == logging.WARNING]
+    assert warnings and "health probe error" in warnings[0].getMessage()
+
+
+def test_lazy_defers_until_formatted():
+    calls = []
+    lazy = auto_scaler._Lazy(lambda: calls.append(1) or "formatted")
+
+    assert calls == []
+    assert "%s" % (lazy,) == "formatted"
+    assert calls == [1]
+
+
+@pytest.mark.parametrize("cpu, replicas, expected", [
+    (0.5, 3, 3),
+    (0.9, 3, 5),
+    (0.1, 3, 2),
+    (0.1, 1, 1),
+])
+def test_make_decider(cpu, replicas, expected):
+    decide = auto_scaler.make_decider(0.5, 2, 1)
+    assert decide(cpu, replicas) == expected
+
+
+class _StopLoop(Exception):
+    pass
+
+
+def _run_one_poll(status):
+    """Runs a single autoscaler iteration and returns the update payloads sent."""
+    responses = iter([status])
+
+    def fake_request(method, url, headers=None, payload=None):
+        if method == auto_scaler.PUT_METHOD:
+            return {}
+        try:
+            return next(responses)
+        except StopIteration:
+            raise _StopLoop
+
+    with patch.object(auto_scaler, "make_request", side_effect=fake_request) as mock_request, \
+            patch("time.sleep"):
+        with pytest.raises(_StopLoop):
+            auto_scaler.run_autoscaler()
+
+    return [c.args[3] for c in mock_request.call_args_list if c.args[0] == auto_scaler.PUT_METHOD]
+
+
+@pytest.mark.parametrize("cpu, replicas, expected", [
+    (0.9, 2, [{"replicas": 3}]),
+    (0.1, 2, [{"replicas": 1}]),
+    (0.1, 1, []),
+    (0.5, 2, []),
+])
+def test_run_autoscaler_scaling(cpu, replicas, expected):
+    assert _run_one_poll({"cpu": {"highPriority": cpu}, "replicas": replicas}) == expected
+
+
+@pytest.mark.parametrize("status", [
+    {"cpu": {"highPriority": 1.5}, "replicas": 2},
+    {"cpu": {}, "replicas": 2},
+    {"cpu": {"highPriority": 0.9}, "replicas": 0},
+    {"cpu": {"highPriority": 0.9}},
+])
+def test_run_autoscaler_ignores_invalid_status(status):
+    assert _run_one_poll(status) == []
+
+
+def test_parse_status_valid():
+    assert auto_scaler.parse_status({"cpu": {"highPriority": 0.25}, "replicas": 3}) == (0.25, 3)
+
+
+@pytest.mark.parametrize("status", [
+    {"cpu": {"highPriority": "0.5"}, "replicas": 3},
+    {"cpu": {"highPriority": -0.1}, "replicas": 3},
+    {"cpu": {"highPriority": 0.5}, "replicas": 2.0},
+    {"cpu": None, "replicas": 3},
+    {"cpu": [0.5], "replicas": 3},
+    {"cpu": {"highPriority": 0.5}},
+    {},
+])
+def test_parse_status_invalid(status):
+    assert auto_scaler.parse_status(status) is None
+
+
+def test_run_autoscaler_keeps_fixed_schedule():
+    statuses = iter([None, None])
+
+    def fake_request(method, url, headers=None, payload=None):
+        try:
+            return next(statuses)
+        except StopIteration:
+            raise _StopLoop
+
+    # Loop start, then "now" after each poll: the first takes 0.3s, the second 2.5s
+    clock = iter([0.0, 0.3, 3.5])
+    with patch.object(auto_scaler, "make_request", side_effect=fake_request), \
+            patch("time.monotonic", side_effect=lambda: next(clock)), \
+            patch("time.sleep") as mock_sleep:
+        with pytest.raises(_StopLoop):
+            auto_scaler.run_autoscaler()
+
+    # Poll 1 sleeps out the rest of its second; poll 2 overran ticks 2.0 and 3.0, so it waits for 4.0
+    assert mock_sleep.call_args_list[0].args[0] == pytest.approx(0.7)
+    assert mock_sleep.call_args_list[1].args[0] == pytest.approx(0.5)
+
+
+def test_validate_config_accepts_test_config():
+    assert auto_scaler.validate_config(auto_scaler.config) == []
+
+
+@pytest.mark.parametrize("key, value", [
+    ("cpu_threshold", 0),
+    ("cpu_threshold", 1.5),
+    ("cpu_threshold", True),
+    ("scale_up_step", 0),
+    ("scale_down_step", 1.5),
+    ("poll_interval", -1),
+    ("base_url", ""),
+    ("tasks", None),
+])
+def test_validate_config_rejects_invalid_setting(key, value):
+    config = dict(auto_scaler.config, **{key: value})
+
+    (error,) = auto_scaler.validate_config(config)
+    assert error.startswith(key)
+
+
+def test_startup_exits_on_invalid_config(tmp_path, monkeypatch):
+    config_path = tmp_path / "bad.yaml"
+    config_path.write_text(CONFIG_YAML.replace("cpu_threshold: 0.5", "cpu_threshold: 2"))
+    monkeypatch.setattr(sys, "argv", ["auto_scaler.py", "--config", str(config_path)])
+
+    with pytest.raises(SystemExit):
+        auto_scaler.startup()
+
+
+@pytest.mark.parametrize("sig", [signal.SIGINT, signal.SIGTERM])
+def test_signal_handler_exits_cleanly(sig):
+    with patch.object(auto_scaler._SESSION, "close") as mock_close:
+        with pytest.raises(SystemExit) as exc_info:
+            auto_scaler.signal_handler(sig, None)
+
+    assert exc_info.value.code == 0
+    mock_close.assert_called_once_with()
@@ -0,0 +1,88 @@
+import json
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+
+from util import logger
+
+
+@pytest.fixture
+def isolated_logging(tmp_path, monkeypatch):
+    """Runs setup_logger() in tmp_path and restores the root logger afterwards."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(logger, "_log_filenames", {})
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    yield tmp_path
+    logger._stop_listener()
+    for handler in root.handlers:
+        if handler not in saved_handlers:
+            handler.close()
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+def test_setup_logger_is_idempotent(isolated_logging):
+    tmp_path = isolated_logging
+
+    logger.setup_logger(log_name="test")
+    logger.setup_logger(log_name="test", log_level=logging.DEBUG)
+
+    root = logging.getLogger()
+    assert len(root.handlers) == 1
+    assert isinstance(root.handlers[0], QueueHandler)
+    assert root.level == logging.DEBUG
+    assert len(list((tmp_path / "logs").iterdir())) == 1
+
+
+def test_setup_logger_writes_off_thread(isolated_logging):
+    tmp_path = isolated_logging
+
+    logger.setup_logger(log_name="test", log_format="%(levelname)s %(message)s")
+    logging.info("hello %s", "world")
+    logger._stop_listener()
+
+    (log_file,) = (tmp_path / "logs").iterdir()
+    assert log_file.read_text(encoding="utf-8") == "INFO hello world\n"
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.LogRecord("root", logging.INFO, __file__, 1, "scaled to %d", (3,), None)
+    record.cpu = 0.9
+
+    entry = json.loads(logger.JsonFormatter().format(record))
+
+    assert entry["lvl"] == "INFO"
+    assert entry["msg"] == "scaled to 3"
+    assert entry["cpu"] == 0.9
+    assert "args" not in entry
+
+
+def test_setup_logger_json_format(isolated_logging):
+    tmp_path = isolated_logging
+
+    logger.setup_logger(log_name="test", log_format="json")
+    logging.info("hello %s", "world", extra={"event": "greet"})
+    logger._stop_listener()
+
+    (log_file,) = (tmp_path / "logs").iterdir()
+    entry = json.loads(log_file.read_text(encoding="utf-8"))
+    assert (entry["msg"], entry["event"]) == ("hello world", "greet")
+
+
+def test_setup_logger_json_format_keeps_exceptions_separate(isolated_logging):
+    tmp_path = isolated_logging
+
+    logger.setup_logger(log_name="test", log_format="json")
+    try:
+        raise ValueError("bad value")
+    except ValueError:
+        logging.exception("boom")
+    logger._stop_listener()
+
+    (log_file,) = (tmp_path / "logs").iterdir()
+    entry = json.loads(log_file.read_text(encoding="utf-8"))
+    assert entry["msg"] == "boom"
+    assert entry["exc"].startswith("Traceback")
+    assert "ValueError: bad value" in entry["exc"]
@@ -1,14 +1,98 @@
+import atexit
+import copy
 import logging
 import os
-from logging.handlers import TimedRotatingFileHandler
+import queue
+from logging.handlers import TimedRotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime,timezone
 
+# orjson is much faster for structured logs; fall back to the stdlib encoder
+try:
+    import orjson
+
+    def _json_dumps(obj):
+        return orjson.dumps(obj, default=str).decode()
+except ImportError:
+    import json
+
+    def _json_dumps(obj):
+        return json.dumps(obj, default=str)
+
+# Attributes every LogRecord has; anything else on a record came from `extra=`
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats each record as a single JSON object.
+
+    The object holds the timestamp, level and message, plus any fields passed
+    through `extra=`, so scaling events can be queried without parsing text.
+    """
+    def format(self, record):
+        entry = {"ts": record.created, "lvl": record.levelname, "msg": record.getMessage()}
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        if record.stack_info:
+            entry["stack"] = record.stack_info
+        return _json_dumps(entry)
+
+class _StructuredQueueHandler(QueueHandler):
+    """
+    A queue handler that keeps the traceback out of the message.
+
+    `QueueHandler.prepare` folds the formatted traceback into `msg` and clears
+    `exc_info`, which would leave `JsonFormatter` nothing to put under "exc".
+    This version renders the traceback into `exc_text` instead, so it still
+    crosses the queue but stays a separate field.
+    """
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.formatter.formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+# Log file name per log_name, stamped once so repeated setup calls share a file
+_log_filenames = {}
+# Background listener that owns the file and console handlers
+_listener = None
+
+def _stop_listener():
+    """
+    Stops the active queue listener, flushing pending records and closing its handlers.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+
+atexit.register(_stop_listener)
+
 def setup_logger(log_name="autoscaler", log_level=logging.INFO, log_format=None):
 
     """
     Sets up a rotating logger that saves logs to 'logs/' with daily rotation.
-    
+
+    The root logger only enqueues records; a background listener thread writes
+    them to the file and console handlers. Calling this again replaces the
+    previous configuration instead of adding a second set of handlers.
+
+    Passing log_format="json" writes one JSON object per record using
+    `JsonFormatter` instead of a text format.
+
     """
+    global _listener
     if log_format is None:
         log_format = "%(asctime)s - %(levelname)s - %(message)s"
 
@@ -16,7 +100,9 @@ def setup_logger(log_name="autoscaler", log_level=logging.INFO, log_format=None)
     os.makedirs("logs", exist_ok=True)
 
     # File name with timestamp
-    log_filename = f"logs/{log_name}_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.log"
+    log_filename = _log_filenames.setdefault(
+        log_name, f"logs/{log_name}_{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.log"
+    )
 
     # Create handler with daily rotation, keep last 7 logs
     file_handler = TimedRotatingFileHandler(
@@ -26,11 +112,22 @@ def setup_logger(log_name="autoscaler", log_level=logging.INFO, log_format=None)
         backupCount=2,
         encoding="utf-8"
     )
-    file_handler.setFormatter(logging.Formatter(log_format))
+    formatter = JsonFormatter() if log_format == "json" else logging.Formatter(log_format)
+    file_handler.setFormatter(formatter)
 
     # Console handler
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(log_format))
+    console_handler.setFormatter(formatter)
+
+    # Hand records to a listener thread so file and console I/O stay off the caller
+    _stop_listener()
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    _listener.start()
+
+    # The queue handler must only merge the message; the listener's handlers apply log_format
+    queue_handler = _StructuredQueueHandler(log_queue) if log_format == "json" else QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
 
     # Configure logger
-    logging.basicConfig(level=log_level, handlers=[file_handler, console_handler])
\ No newline at end of file
+    logging.basicConfig(level=log_level, handlers=[queue_handler], force=True)